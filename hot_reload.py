@@ -1,17 +1,24 @@
 import sys
 import time
-import importlib
+import importlib.util
 import os
-import hashlib
+import threading
+import signal
+import functools
+import contextlib
+import math
 from pathlib import Path
-from typing import Dict, Optional, Callable
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-import argparse
-from datetime import datetime
+from typing import Dict, Final, Optional, Callable, Tuple
 
 VERSION = "1.0.0"
 
+# Window used to coalesce the burst of events editors emit per save
+DEBOUNCE_SECONDS = 0.05
+DEBOUNCE_NS = int(DEBOUNCE_SECONDS * 1_000_000_000)
+
+# How long to wait for the observer thread on shutdown before giving up on it
+OBSERVER_JOIN_TIMEOUT = 2.0
+
 LOGO = """
 🔄 Hot Reload v{version}
 by Gianluca Zugno
@@ -32,7 +39,10 @@ Examples:
   4. Disable UI elements:
      python hot_reload.py test_module -noUI
   
-  5. Show version:
+  5. Poll for changes (network drives, SMB/CIFS mounts):
+     python hot_reload.py test_module --poll --poll-interval 2
+  
+  6. Show version:
      python hot_reload.py -v
 """
 
@@ -40,161 +50,373 @@ def print_version():
     """Print version information with logo."""
     print(LOGO.format(version=VERSION))
 
+GREEN: Final[str] = '\033[92m'
+RED: Final[str] = '\033[91m'
+BLUE: Final[str] = '\033[94m'
+YELLOW: Final[str] = '\033[93m'
+RESET: Final[str] = '\033[0m'
+BOLD: Final[str] = '\033[1m'
+
+# Built once at import, only the module name and time are filled in per call
+_HEADER_TMPL: Final[str] = f"""
+{BOLD}{'='*60}
+🔄 Hot Reload Monitor Active
+{'='*60}{RESET}
+📦 Module: {BLUE}{{module}}{RESET}
+⏰ Started at: {YELLOW}{{time}}{RESET}
+📝 Press Ctrl+C to stop
+{'='*60}
+"""
+
 class ConsoleUI:
     COLORS = {
-        'green': '\033[92m',
-        'red': '\033[91m',
-        'blue': '\033[94m',
-        'yellow': '\033[93m',
-        'reset': '\033[0m',
-        'bold': '\033[1m'
+        'green': GREEN,
+        'red': RED,
+        'blue': BLUE,
+        'yellow': YELLOW,
+        'reset': RESET,
+        'bold': BOLD
     }
 
+    _ansi_enabled = False
+
+    @staticmethod
+    def enable_ansi():
+        """Make sure the terminal understands ANSI escapes (only needed on legacy Windows consoles)."""
+        if ConsoleUI._ansi_enabled:
+            return
+        ConsoleUI._ansi_enabled = True
+        if os.name != 'nt':
+            return
+        try:
+            import colorama
+            colorama.just_fix_windows_console()
+        except (ImportError, AttributeError):
+            # Spawning any command once switches the console into VT processing mode
+            os.system('')
+
     @staticmethod
     def clear_console():
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Same sequence as `clear` (screen, scrollback, cursor home) without forking a shell
+        sys.stdout.write('\x1b[2J\x1b[3J\x1b[H')
+        sys.stdout.flush()
 
     @staticmethod
     def print_header(module_name: str):
-        print(f"""
-{ConsoleUI.COLORS['bold']}{'='*60}
-🔄 Hot Reload Monitor Active
-{'='*60}{ConsoleUI.COLORS['reset']}
-📦 Module: {ConsoleUI.COLORS['blue']}{module_name}{ConsoleUI.COLORS['reset']}
-⏰ Started at: {ConsoleUI.COLORS['yellow']}{datetime.now().strftime('%H:%M:%S')}{ConsoleUI.COLORS['reset']}
-📝 Press Ctrl+C to stop
-{'='*60}
-""")
+        print(_HEADER_TMPL.format(module=module_name, time=time.strftime('%H:%M:%S')))
 
     @staticmethod
     def print_success(message: str):
-        print(f"\n{ConsoleUI.COLORS['green']}✓ {message}{ConsoleUI.COLORS['reset']}")
+        print(f"\n{GREEN}✓ {message}{RESET}")
 
     @staticmethod
     def print_error(message: str):
-        print(f"\n{ConsoleUI.COLORS['red']}✗ {message}{ConsoleUI.COLORS['reset']}")
+        print(f"\n{RED}✗ {message}{RESET}")
+
+def _scan_dir(directory: Path) -> Dict[str, os.DirEntry]:
+    """Return the entries of directory keyed by name, or an empty dict if it doesn't exist."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+@functools.lru_cache(maxsize=128)
+def _resolve_module(target_module: str, cwd: str) -> Tuple[str, Path]:
+    """Find the file for target_module under cwd and return its dotted name and resolved path.
+
+    Results are cached per (target_module, cwd) so repeated reloaders skip the path search.
+    """
+    # Try different possible module paths
+    base_paths = [
+        Path(),  # Current directory
+        Path('Utils'),  # Utils directory
+    ]
+    
+    module_path = Path(target_module)
+    module_name = module_path.stem  # Get name without extension
+    
+    root = Path(cwd)
+    possible_paths = []
+    for base in base_paths:
+        candidates = [
+            base / f"{module_name}.py",  # Direct path
+            base / module_name / "__init__.py",  # Package
+            base / f"{module_path}.py",  # Full path provided
+        ]
+        possible_paths.extend(candidates)
+
+        # One directory read per base answers the direct-child checks without a stat each
+        entries = _scan_dir(root / base)
+        for path in candidates:
+            if path.parent == base:
+                entry = entries.get(path.name)
+                found = entry is not None and entry.is_file()
+            elif path.parent.parent == base:
+                entry = entries.get(path.parent.name)
+                found = entry is not None and entry.is_dir() and (root / path).is_file()
+            else:
+                found = (root / path).is_file()
+            
+            if found:
+                # Convert file path to module notation
+                dotted_name = str(path.with_suffix('')).replace(os.sep, '.')
+                if dotted_name.startswith('.'):
+                    dotted_name = dotted_name[1:]
+                # Return the actual file path for watching, resolved once up front
+                return dotted_name, (root / path).resolve()
+    
+    # If we get here, the module wasn't found
+    raise ImportError(
+        f"Could not find module '{target_module}'. Searched in:\n" + 
+        "\n".join(f"- {p}" for p in possible_paths) +
+        "\n\nMake sure the file exists in either the current directory or the Utils directory."
+    )
+
+def _positive_seconds(value: str) -> float:
+    """argparse type for intervals: a finite number of seconds greater than zero."""
+    import argparse
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of seconds: '{value}'")
+    if not (math.isfinite(seconds) and seconds > 0):
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0, got '{value}'")
+    return seconds
 
 class CodeReloader:
-    def __init__(self, target_module: str, callback: Optional[Callable] = None, show_ui: bool = True, clear_on_reload: bool = False):
+    def __init__(self, target_module: str, callback: Optional[Callable] = None, show_ui: bool = True, clear_on_reload: bool = False,
+                 use_polling: bool = False, poll_interval: float = 5.0, confirm_change: bool = False):
         self.target_module = target_module
         self.callback = callback
         self.module = None
-        self.file_hashes: Dict[str, str] = {}
-        self.observer = Observer()
+        self._last_stat: Tuple[int, int] = (0, 0)
+        # A zero or negative interval makes the polling observer spin without sleeping
+        if not (math.isfinite(poll_interval) and poll_interval > 0):
+            raise ValueError(f"poll_interval must be a positive number of seconds, got {poll_interval!r}")
+        # Native observers miss events on network filesystems, polling is opt-in for those.
+        # watchdog is imported here so library users only pay for it when they watch something.
+        if use_polling:
+            from watchdog.observers.polling import PollingObserver
+            self.observer = PollingObserver(timeout=poll_interval)
+        else:
+            from watchdog.observers import Observer
+            self.observer = Observer()
         self.watch_path = Path().absolute()
         self.show_ui = show_ui
         self.clear_on_reload = clear_on_reload
+        self.confirm_change = confirm_change
+        self._paths_added = False
+        self._last_reload_ns = 0
+        self._pending: Optional[threading.Timer] = None
+        self._closed = False
+        self._debounce_lock = threading.Lock()
+        # Reloads can come from the watchdog thread or the trailing timer, never run two at once
+        self._reload_lock = threading.Lock()
         
         # Verify module exists before starting
         self._verify_module_exists()
+        self._resolved_module_path_str = str(self.module_file_path)
+        
+        # Load straight from the file on every reload instead of going through the import finders
+        spec_name = self.module_name[:-len('.__init__')] if self.module_name.endswith('.__init__') else self.module_name
+        self._spec = importlib.util.spec_from_file_location(spec_name, self.module_file_path)
+        
+        if self.clear_on_reload:
+            ConsoleUI.enable_ansi()
         
         if self.show_ui:
             ConsoleUI.print_header(self.module_name)
     
     def _verify_module_exists(self):
         """Verify the module exists and set the correct module name."""
-        # Try different possible module paths
-        base_paths = [
-            Path(),  # Current directory
-            Path('Utils'),  # Utils directory
-        ]
-        
-        module_path = Path(self.target_module)
-        module_name = module_path.stem  # Get name without extension
-        
-        possible_paths = []
-        for base in base_paths:
-            possible_paths.extend([
-                base / f"{module_name}.py",  # Direct path
-                base / module_name / "__init__.py",  # Package
-                base / f"{module_path}.py",  # Full path provided
-            ])
-        
-        for path in possible_paths:
-            if path.exists():
-                # Convert file path to module notation
-                self.module_name = str(path.with_suffix('')).replace(os.sep, '.')
-                if self.module_name.startswith('.'):
-                    self.module_name = self.module_name[1:]
-                # Store the actual file path for watching
-                self.module_file_path = path
-                return
-        
-        # If we get here, the module wasn't found
-        raise ImportError(
-            f"Could not find module '{self.target_module}'. Searched in:\n" + 
-            "\n".join(f"- {p}" for p in possible_paths) +
-            "\n\nMake sure the file exists in either the current directory or the Utils directory."
-        )
-
-    def _get_file_hash(self, filepath: str) -> str:
-        with open(filepath, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
-    
-    def _has_file_changed(self, filepath: str) -> bool:
-        if not os.path.exists(filepath):
+        cwd = str(Path().absolute())
+        self.module_name, self.module_file_path = _resolve_module(self.target_module, cwd)
+        # A cached result goes stale if the file was moved or deleted, one stat confirms it
+        if not os.path.isfile(self.module_file_path):
+            _resolve_module.cache_clear()
+            self.module_name, self.module_file_path = _resolve_module(self.target_module, cwd)
+
+    def _has_file_changed(self, filepath: str, stat: Optional[os.stat_result] = None) -> bool:
+        if stat is None:
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                return False
+
+        # (mtime, size) from a single stat call is the whole change check
+        current = (stat.st_mtime_ns, stat.st_size)
+        if current == self._last_stat:
             return False
-            
-        current_hash = self._get_file_hash(filepath)
-        if filepath not in self.file_hashes:
-            self.file_hashes[filepath] = current_hash
-            return True
-            
-        if current_hash != self.file_hashes[filepath]:
-            self.file_hashes[filepath] = current_hash
-            return True
-        return False
+        self._last_stat = current
+        return True
 
     def _add_current_dir_to_path(self):
         """Add the current directory and Utils directory to Python's path."""
+        if self._paths_added:
+            return
+
         paths_to_add = [
             str(self.watch_path),  # Current directory
             str(self.watch_path / 'Utils'),  # Utils directory
         ]
         
+        existing = set(sys.path)
         for path in paths_to_add:
-            if os.path.exists(path) and path not in sys.path:
+            if path not in existing and os.path.exists(path):
                 sys.path.insert(0, path)
+                existing.add(path)
+        self._paths_added = True
+
+    def close(self):
+        """Stop the observer and any pending reload without blocking indefinitely."""
+        with self._debounce_lock:
+            # No new trailing reloads can be scheduled once this is set
+            self._closed = True
+            pending = self._pending
+            self._pending = None
+            if pending is not None:
+                pending.cancel()
+
+        self.observer.stop()
+        if self.observer.is_alive():
+            # A native watcher can be stuck mid-call (e.g. ReadDirectoryChangesW), so don't wait forever
+            self.observer.join(timeout=OBSERVER_JOIN_TIMEOUT)
+            if self.observer.is_alive() and self.show_ui:
+                ConsoleUI.print_error(f"File watcher did not stop within {OBSERVER_JOIN_TIMEOUT:g}s, leaving it to exit with the process")
+
+        # cancel() doesn't stop a timer that already fired, so wait for any reload still in flight;
+        # reload_module checks _closed under the same lock, so nothing runs after this returns
+        if self._reload_lock.acquire(timeout=OBSERVER_JOIN_TIMEOUT):
+            self._reload_lock.release()
+        elif self.show_ui:
+            ConsoleUI.print_error(f"Reload did not finish within {OBSERVER_JOIN_TIMEOUT:g}s, leaving it to exit with the process")
 
     def reload_module(self):
-        try:
-            if self.clear_on_reload:
-                ConsoleUI.clear_console()
-                if self.show_ui:
-                    ConsoleUI.print_header(self.module_name)
+        with self._reload_lock:
+            if self._closed:
+                return
+            try:
+                if self.clear_on_reload:
+                    ConsoleUI.clear_console()
+                    if self.show_ui:
+                        ConsoleUI.print_header(self.module_name)
 
-            # Add current directory to Python's path
-            self._add_current_dir_to_path()
+                if self.module is None:
+                    # Sibling imports inside the module still resolve through sys.path
+                    self._add_current_dir_to_path()
 
-            if self.module is None:
-                self.module = importlib.import_module(self.module_name)
-            else:
-                self.module = importlib.reload(self.module)
+                # Register before executing so relative imports see the module, as the import system does
+                module = importlib.util.module_from_spec(self._spec)
+                previous = sys.modules.get(self._spec.name)
+                sys.modules[self._spec.name] = module
+                try:
+                    self._spec.loader.exec_module(module)
+                except BaseException:
+                    # Keep the last good version importable if the new code fails
+                    if previous is not None:
+                        sys.modules[self._spec.name] = previous
+                    else:
+                        sys.modules.pop(self._spec.name, None)
+                    raise
+                self.module = module
                 
-            if self.callback:
-                self.callback(self.module)
+                if self.callback:
+                    self.callback(self.module)
             
-            if self.show_ui:
-                ConsoleUI.print_success(f"Successfully reloaded {self.module_name} at {time.strftime('%H:%M:%S')}")
-        except Exception as e:
-            if self.show_ui:
-                ConsoleUI.print_error(f"Error reloading {self.module_name}: {str(e)}")
-                ConsoleUI.print_error(f"Module path: {Path(self.module_name.replace('.', os.sep)).with_suffix('.py')}")
-
-class FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, reloader: CodeReloader):
-        self.reloader = reloader
+                if self.show_ui:
+                    ConsoleUI.print_success(f"Successfully reloaded {self.module_name} at {time.strftime('%H:%M:%S')}")
+            except Exception as e:
+                if self.show_ui:
+                    ConsoleUI.print_error(f"Error reloading {self.module_name}: {str(e)}")
+                    ConsoleUI.print_error(f"Module path: {Path(self.module_name.replace('.', os.sep)).with_suffix('.py')}")
+            finally:
+                # The debounce window starts when a reload finishes, so events queued behind a slow reload are batched
+                self._last_reload_ns = time.monotonic_ns()
+
+@functools.lru_cache(maxsize=None)
+def _file_change_handler_class():
+    """Build FileChangeHandler on first use so importing this module doesn't pull in watchdog."""
+    from watchdog.events import FileSystemEventHandler
+
+    class FileChangeHandler(FileSystemEventHandler):
+        def __init__(self, reloader: CodeReloader):
+            self.reloader = reloader
+            self._target = reloader._resolved_module_path_str
         
-    def on_modified(self, event):
-        if event.src_path.endswith('.py'):
-            # Convert paths to absolute for comparison
-            event_path = Path(event.src_path).resolve()
-            module_path = Path(self.reloader.module_file_path).resolve()
-            
-            if event_path == module_path and self.reloader._has_file_changed(str(event_path)):
-                self.reloader.reload_module()
+        def on_modified(self, event):
+            self._handle(event.src_path)
+
+        def on_created(self, event):
+            # Creation fires before any bytes are written, so only arm the trailing reload
+            self._handle(event.src_path, immediate=False)
+
+        def on_moved(self, event):
+            # Atomic saves write a temp file and rename it over the target
+            self._handle(event.dest_path)
+
+        def _handle(self, src_path: str, immediate: bool = True):
+            # Plain string checks only, no Path objects on the event path
+            if '__pycache__' in src_path:
+                return
+            if not src_path.endswith('.py'):
+                return
+            # Events are reported under the resolved directory we scheduled, so they match verbatim
+            if src_path != self._target:
+                return
+            # Skip the transient gap where the original has been removed but not yet replaced
+            try:
+                stat = os.stat(src_path)
+            except FileNotFoundError:
+                return
+            # The event itself is the signal; only compare stats when asked to
+            if self.reloader.confirm_change and not self.reloader._has_file_changed(src_path, stat):
+                return
+            self._schedule_reload(immediate)
+
+        def _schedule_reload(self, immediate: bool = True):
+            """Reload on the first event of a burst, then batch the rest into one trailing reload."""
+            reloader = self.reloader
+            with reloader._debounce_lock:
+                if reloader._closed:
+                    return
+                if reloader._pending is not None:
+                    reloader._pending.cancel()
+                    reloader._pending = None
+
+                now = time.monotonic_ns()
+                if not immediate or now - reloader._last_reload_ns < DEBOUNCE_NS:
+                    # Still inside the window: restart the trailing timer so the final state wins
+                    timer = threading.Timer(DEBOUNCE_SECONDS, self._run_pending_reload)
+                    # The timer gets itself as its argument so a superseded timer can tell it was replaced
+                    timer.args = (timer,)
+                    timer.daemon = True
+                    reloader._pending = timer
+                    timer.start()
+                    return
+
+            reloader.reload_module()
+
+        def _run_pending_reload(self, timer: threading.Timer):
+            reloader = self.reloader
+            with reloader._debounce_lock:
+                # cancel() can't stop a timer that already fired, so a newer one may have taken its place
+                if reloader._pending is not timer:
+                    return
+                reloader._pending = None
+            reloader.reload_module()
 
-def watch_and_reload(target_module: str, callback: Optional[Callable] = None, show_ui: bool = True, clear_on_reload: bool = False):
+    return FileChangeHandler
+
+def __getattr__(name: str):
+    # Keep ``hot_reload.FileChangeHandler`` available to library users
+    if name == 'FileChangeHandler':
+        return _file_change_handler_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def watch_and_reload(target_module: str, callback: Optional[Callable] = None, show_ui: bool = True, clear_on_reload: bool = False,
+                     use_polling: bool = False, poll_interval: float = 5.0, confirm_change: bool = False):
     """
     Watch for changes in Python files and reload the target module.
     
@@ -203,26 +425,45 @@ def watch_and_reload(target_module: str, callback: Optional[Callable] = None, sh
         callback: Optional callback function to run after successful reload
         show_ui: Whether to show the UI elements
         clear_on_reload: Whether to clear the console on each reload
+        use_polling: Whether to poll the filesystem instead of using native events
+        poll_interval: Seconds between polls when use_polling is enabled
+        confirm_change: Whether to check the file's mtime and size changed before reloading
     """
     target_module = target_module.replace('.py', '')
     
-    reloader = CodeReloader(target_module, callback, show_ui, clear_on_reload)
-    event_handler = FileChangeHandler(reloader)
-    
-    reloader.observer.schedule(event_handler, str(reloader.watch_path), recursive=True)
-    reloader.observer.start()
-    
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        reloader.observer.stop()
-        if show_ui:
-            print(f"\n{ConsoleUI.COLORS['yellow']}Stopping file watch...{ConsoleUI.COLORS['reset']}")
+    reloader = CodeReloader(target_module, callback, show_ui, clear_on_reload, use_polling, poll_interval, confirm_change)
+    event_handler = _file_change_handler_class()(reloader)
     
-    reloader.observer.join()
+    with contextlib.closing(reloader):
+        # Only the directory holding the module needs watching
+        reloader.observer.schedule(event_handler, str(reloader.module_file_path.parent), recursive=False)
+        reloader.observer.start()
+        
+        # Block until Ctrl+C instead of waking up to poll (except on Windows, see below)
+        stop = threading.Event()
+        previous_handler = None
+        in_main_thread = threading.current_thread() is threading.main_thread()
+        if in_main_thread:
+            previous_handler = signal.signal(signal.SIGINT, lambda *_: stop.set())
+        
+        try:
+            if os.name == 'nt':
+                # Untimed waits can't be interrupted by Ctrl+C on Windows, so wake up periodically there
+                while not stop.wait(1):
+                    pass
+            else:
+                stop.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if in_main_thread:
+                signal.signal(signal.SIGINT, previous_handler)
+            if show_ui:
+                print(f"\n{YELLOW}Stopping file watch...{RESET}")
 
 if __name__ == "__main__":
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Hot reload Python modules',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -245,6 +486,20 @@ if __name__ == "__main__":
                        action='store_true', 
                        help='Clear console on each reload')
     
+    parser.add_argument('--poll', 
+                       action='store_true', 
+                       help='Poll for changes instead of using native filesystem events')
+    
+    parser.add_argument('--poll-interval', 
+                       type=_positive_seconds, 
+                       default=5.0, 
+                       metavar='SECONDS', 
+                       help='Seconds between polls when --poll is set (default: 5)')
+    
+    parser.add_argument('--confirm-change', 
+                       action='store_true', 
+                       help='Only reload when the file\'s modification time or size changed')
+    
     args = parser.parse_args()
     
     # Handle version flag
@@ -259,7 +514,9 @@ if __name__ == "__main__":
     
     try:
         module_name = args.module.replace('.py', '')
-        watch_and_reload(module_name, show_ui=not args.noUI, clear_on_reload=args.clear)
+        watch_and_reload(module_name, show_ui=not args.noUI, clear_on_reload=args.clear,
+                         use_polling=args.poll, poll_interval=args.poll_interval,
+                         confirm_change=args.confirm_change)
     except ImportError as e:
         ConsoleUI.print_error(str(e))
         sys.exit(1)